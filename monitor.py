@@ -8,34 +8,54 @@ stores results in a local SQLite database, sends email alerts on status changes,
 and provides a simple web dashboard (current status + recent history).
 
 Features:
-    - Periodic checks for each service using requests.
-    - Email alerts (uses SMTP) when a service goes UP->DOWN or DOWN->UP.
+    - Periodic checks for each service using requests (run concurrently),
+      in a separate monitor process that shares state through the DB.
+    - Email alerts (uses SMTP) when a service goes UP->DOWN or DOWN->UP,
+      batched into one email per ALERT_BATCH_WINDOW.
     - SQLite via SQLAlchemy for storing check results.
     - Flask web server with:
-        * Home page: color-coded table for UP/DOWN.
+        * Home page: color-coded table for UP/DOWN (UNKNOWN if stale).
         * /status endpoint: JSON output of current statuses.
-        * /history endpoint: shows last N checks per service from the DB.
+        * /history endpoint: shows recent UP/DOWN intervals per service from the DB.
 
 Usage:
     1) pip install -r requirements.txt
     2) python monitor.py
+       (or, for production: gunicorn -w 1 --threads 8 -k gthread wsgi:app)
     3) Open http://127.0.0.1:5000 in your browser
 
 Configuration:
     - Update SERVICES list for your target URLs.
     - Update CHECK_INTERVAL to change check frequency (default: 60s).
+    - Update FAIL_STREAK to change how many failed checks in a row mark a
+      service DOWN (default: 2).
+    - Update HEARTBEAT_INTERVAL to change how often unchanged statuses are
+      still recorded in the DB (default: 1h).
     - Update SMTP settings + credentials for your email alerts.
+    - Update ALERT_BATCH_WINDOW to change how long alerts are grouped (default: 30s).
 """
 
+import os
+import sys
 import time
+import atexit
+import signal
 import threading
+import multiprocessing
 import smtplib
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 
+import orjson
 import requests
-from flask import Flask, jsonify
-from sqlalchemy import create_engine, Column, Integer, String, Boolean, DateTime
-from sqlalchemy.orm import sessionmaker, declarative_base
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from flask import Flask, Response, render_template
+from markupsafe import escape
+from sqlalchemy import create_engine, event, delete, func, insert, inspect, select, text, union_all
+from sqlalchemy import Column, PrimaryKeyConstraint, BigInteger, String, Boolean, DateTime
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import sessionmaker, scoped_session, declarative_base
 
 # -------------------- CONFIGURATION --------------------
 
@@ -48,6 +68,34 @@ SERVICES = [
 # How many seconds to wait between checks
 CHECK_INTERVAL = 60  # 1 minute
 
+# A service whose last check is older than this (in seconds) is shown as
+# UNKNOWN, e.g. because the monitor process died or hasn't started checking yet
+STATUS_STALE_AFTER = 3 * CHECK_INTERVAL
+
+# How often (in seconds) the web process checks that the monitor process is
+# still running, and restarts it if it isn't
+MONITOR_WATCHDOG_INTERVAL = 10
+
+# Upper bound on how many services are checked at the same time
+MAX_CONCURRENT_CHECKS = 32
+
+# HTTP timeouts for each attempt, in seconds: (connect, read)
+CHECK_TIMEOUT = (3.05, 5)
+
+# Retries of the HEAD probe for connection errors and 5xx answers, with
+# exponential backoff between attempts (urllib3 1.26: no wait before the first
+# retry, then 0.6s). Retry-After headers are ignored. The fallback GET for
+# servers that reject HEAD is a single attempt, so a check takes at most
+# (CHECK_RETRIES + 2) * sum(CHECK_TIMEOUT) + backoff, about 33s.
+CHECK_RETRIES = 2
+CHECK_BACKOFF_FACTOR = 0.3
+
+# A service is only reported DOWN after this many consecutive failed checks
+FAIL_STREAK = 2
+
+# Responses to HEAD that mean "try again with GET" (server doesn't allow HEAD)
+HEAD_REJECTED_CODES = (403, 405, 501)
+
 # Email alert settings (example for Gmail)
 SMTP_SERVER = "smtp.gmail.com"
 SMTP_PORT = 587
@@ -55,53 +103,160 @@ SENDER_EMAIL = "[email protected]"      # Replace with your email
 SENDER_PASSWORD = "YOUR_APP_PASSWORD"  # Use an App Password or secure method
 ALERT_RECIPIENT = "[email protected]"    # Where alerts get sent
 
+# Status changes within this many seconds are grouped into a single email
+ALERT_BATCH_WINDOW = 30
+
+# The SMTP connection is kept open between alerts; send a NOOP this often
+# (in seconds) so the server doesn't drop it as idle
+SMTP_KEEPALIVE_INTERVAL = 60
+SMTP_TIMEOUT = 30  # seconds
+
 # Database configuration
 DB_URL = "sqlite:///downtime_monitor.db"  # local SQLite file
 
 # How many recent checks to show on /history page for each service
 MAX_HISTORY = 20
 
+# Check results are only written to the DB when a service changes status,
+# plus one "heartbeat" row per service at least this often (in seconds)
+HEARTBEAT_INTERVAL = 60 * 60  # 1 hour
+
+# How many seconds between "PRAGMA optimize" runs on the SQLite database
+OPTIMIZE_INTERVAL = 15 * 60  # 15 minutes
+
 # -------------------- SET UP DATABASE (SQLAlchemy) --------------------
 Base = declarative_base()
 
 class CheckResult(Base):
     __tablename__ = "check_results"
-    id = Column(Integer, primary_key=True, autoincrement=True)
+    id = Column(BigInteger, nullable=False, autoincrement=False)  # see next_check_id()
     service_name = Column(String, nullable=False)
     status = Column(Boolean, nullable=False)  # True=UP, False=DOWN
-    timestamp = Column(DateTime, nullable=False)
+    timestamp = Column(DateTime, nullable=False)  # UTC
+
+    # On SQLite this is a WITHOUT ROWID table clustered on (service_name, id):
+    # each service's rows are stored together in id order, so /history reads
+    # them with a short sequential range scan of the primary key.
+    __table_args__ = (
+        PrimaryKeyConstraint("service_name", "id"),
+        {"sqlite_with_rowid": False},
+    )
+
+
+class ServiceStatus(Base):
+    """
+    Latest UP/DOWN state per service, written by the monitor process every
+    tick and read by the web process (the two don't share memory).
+    """
+    __tablename__ = "service_status"
+    service_name = Column(String, primary_key=True)
+    status = Column(Boolean, nullable=False)  # True=UP, False=DOWN
+    changed_at = Column(DateTime, nullable=False)  # UTC, last status change
+    checked_at = Column(DateTime, nullable=False)  # UTC, last check
 
 engine = create_engine(DB_URL, echo=False)  # echo=True for SQL debug
-Base.metadata.create_all(engine)
-SessionLocal = sessionmaker(bind=engine)
 
-# -------------------- FLASK APP SETUP --------------------
-app = Flask(__name__)
+# On-disk SQLite: use WAL so the web process can read while the monitor process
+# is writing, and relax fsyncs to once per checkpoint instead of twice per commit.
+IS_SQLITE_FILE = DB_URL.startswith("sqlite") and ":memory:" not in DB_URL
+
+if IS_SQLITE_FILE:
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-20000")      # ~20 MB page cache
+        cursor.execute("PRAGMA mmap_size=268435456")    # 256 MB memory map
+        cursor.close()
 
-# current_status dict to store the immediate UP/DOWN state in memory
-# e.g., current_status["Google"] = True/False
-current_status = {}
+Base.metadata.create_all(engine)
+# service_status is rewritten by the monitor every tick, so a copy created
+# before it had checked_at can simply be recreated
+if "checked_at" not in {col["name"] for col in inspect(engine).get_columns("service_status")}:
+    ServiceStatus.__table__.drop(engine)
+    ServiceStatus.__table__.create(engine)
+SessionLocal = sessionmaker(bind=engine)
 
-@app.route("/")
-def home():
+# Thread-local sessions for Flask request handlers (removed after each request)
+db_session = scoped_session(SessionLocal)
+
+# INSERT for new check rows; on SQLite a duplicate key is skipped, not an error
+if engine.dialect.name == "sqlite":
+    insert_check_results = sqlite_insert(CheckResult.__table__).on_conflict_do_nothing()
+else:
+    insert_check_results = insert(CheckResult.__table__)
+
+# Upsert for service_status rows, one statement per tick on SQLite
+if engine.dialect.name == "sqlite":
+    _status_insert = sqlite_insert(ServiceStatus.__table__)
+    upsert_service_status = _status_insert.on_conflict_do_update(
+        index_elements=[ServiceStatus.service_name],
+        set_={
+            "status": _status_insert.excluded.status,
+            "changed_at": _status_insert.excluded.changed_at,
+            "checked_at": _status_insert.excluded.checked_at,
+        },
+    )
+else:
+    upsert_service_status = None  # other databases: DELETE + INSERT below
+
+_last_check_id = 0
+
+
+def next_check_id():
     """
-    Render a color-coded table of current status for all services.
+    Returns a new check row id: the current time in microseconds since the
+    epoch, bumped if needed so ids always increase (UUIDv7-style ordering).
+    Only called from the monitor process.
     """
-    # Build HTML rows
-    rows_html = ""
-    for svc in SERVICES:
-        name = svc["name"]
-        is_up = current_status.get(name, False)
-        color = "#c8e6c9" if is_up else "#ffcdd2"  # greenish if up, redish if down
-        status_text = "UP" if is_up else "DOWN"
-        rows_html += f"""
-        <tr style="background-color: {color};">
-            <td>{name}</td>
-            <td>{status_text}</td>
-        </tr>
-        """
-
-    html_template = f"""
+    global _last_check_id
+    _last_check_id = max(time.time_ns() // 1000, _last_check_id + 1)
+    return _last_check_id
+
+# -------------------- HTTP SESSION (connection pooling) --------------------
+# One shared Session keeps keep-alive connections to each service open between
+# ticks, so later checks skip the TCP + TLS handshake.
+http_session = requests.Session()
+http_session.headers.update({
+    "User-Agent": "DowntimeMonitor/1.0",
+    "Accept-Encoding": "identity",
+})
+http_adapter = HTTPAdapter(
+    pool_connections=max(1, len(SERVICES)),
+    pool_maxsize=max(1, len(SERVICES)) * 2,
+    max_retries=Retry(
+        total=CHECK_RETRIES,
+        backoff_factor=CHECK_BACKOFF_FACTOR,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=("HEAD", "GET"),
+        raise_on_status=False,  # hand back the last 5xx instead of raising
+        respect_retry_after_header=False,  # a huge Retry-After would stall the tick
+    ),
+)
+http_session.mount("https://", http_adapter)
+http_session.mount("http://", http_adapter)
+
+# The fallback GET (servers that reject HEAD) goes through its own retry-free
+# Session, so one check never runs two full retry cycles
+http_fallback_session = requests.Session()
+http_fallback_session.headers.update(http_session.headers)
+http_fallback_adapter = HTTPAdapter(
+    pool_connections=max(1, len(SERVICES)),
+    pool_maxsize=max(1, len(SERVICES)),
+)
+http_fallback_session.mount("https://", http_fallback_adapter)
+http_fallback_session.mount("http://", http_fallback_adapter)
+
+# -------------------- HTML TEMPLATES --------------------
+# Static page chunks are built once at import; handlers only format the rows.
+# The /history page is a Jinja template instead (templates/history.html).
+UP_COLOR = "#c8e6c9"       # greenish if up
+DOWN_COLOR = "#ffcdd2"     # redish if down
+UNKNOWN_COLOR = "#e0e0e0"  # grey if the status is missing or stale
+
+HOME_HEADER = """
     <html>
     <head>
         <title>Downtime Monitor</title>
@@ -114,176 +269,579 @@ def home():
                 <th>Service</th>
                 <th>Status</th>
             </tr>
-            {rows_html}
+"""
+HOME_ROW_TEMPLATE = """
+        <tr style="background-color: {color};">
+            <td>{name}</td>
+            <td>{status}</td>
+        </tr>
+"""
+HOME_FOOTER = """
         </table>
         <p>Check <a href="/history">/history</a> for recent checks.</p>
         <p>Check <a href="/status">/status</a> for JSON status.</p>
     </body>
     </html>
+"""
+
+# Color and status text only depend on UP/DOWN, so bake them into one row
+# format per state and keep its bound .format; a row then only needs the name.
+_home_up_row = HOME_ROW_TEMPLATE.format(color=UP_COLOR, name="{0}", status="UP").format
+_home_down_row = HOME_ROW_TEMPLATE.format(color=DOWN_COLOR, name="{0}", status="DOWN").format
+_home_unknown_row = HOME_ROW_TEMPLATE.format(color=UNKNOWN_COLOR, name="{0}", status="UNKNOWN").format
+
+# -------------------- FLASK APP SETUP --------------------
+app = Flask(__name__)
+
+# The monitor runs in its own process, so the web process reads the current
+# UP/DOWN state from the service_status table. It's cached in memory as an
+# immutable snapshot (loaded_at, {"Google": True/False/None, ...}) for at most
+# STATUS_REFRESH_INTERVAL seconds; a refresh rebinds it in one assignment.
+STATUS_REFRESH_INTERVAL = 5  # seconds
+_status_snapshot = None
+
+# Serialized /status payload, reused while the status snapshot is unchanged.
+# The cache is (snapshot dict, body).
+STATUS_MAX_AGE = 5  # seconds browsers/proxies may reuse a /status response
+_UP, _DOWN, _UNKNOWN = "UP", "DOWN", "UNKNOWN"
+_status_cache = None
+
+
+def get_current_status():
+    """
+    Returns {service name: is_up} as last written by the monitor process.
+    is_up is None if the last check is older than STATUS_STALE_AFTER (the
+    monitor isn't running or is stuck); never-checked services are missing.
+    """
+    global _status_snapshot
+    snapshot = _status_snapshot
+    if snapshot is None or time.monotonic() - snapshot[0] >= STATUS_REFRESH_INTERVAL:
+        fresh_since = datetime.utcnow() - timedelta(seconds=STATUS_STALE_AFTER)
+        with engine.connect() as conn:
+            rows = conn.execute(select(
+                ServiceStatus.service_name, ServiceStatus.status, ServiceStatus.checked_at
+            ))
+            statuses = {
+                name: status if checked_at >= fresh_since else None
+                for name, status, checked_at in rows
+            }
+        snapshot = (time.monotonic(), statuses)
+        _status_snapshot = snapshot
+    return snapshot[1]
+
+
+@app.teardown_request
+def remove_db_session(exc=None):
+    """
+    Release the request's thread-local DB session.
     """
-    return html_template
+    db_session.remove()
+
+
+@app.route("/")
+def home():
+    """
+    Render a color-coded table of current status for all services.
+    """
+    snapshot = get_current_status()
+    rows = []
+    for svc in SERVICES:
+        name = svc["name"]
+        is_up = snapshot.get(name)
+        if is_up is None:
+            row_fmt = _home_unknown_row
+        else:
+            row_fmt = _home_up_row if is_up else _home_down_row
+        rows.append(row_fmt(escape(name)))
+    return HOME_HEADER + "".join(rows) + HOME_FOOTER
 
 
 @app.route("/status")
 def status_json():
     """
     Returns the current status as JSON: {"Google": "UP", "GitHub": "DOWN", ...}
+    A service without a recent check is reported as "UNKNOWN".
     """
-    status_dict = {}
-    for svc in SERVICES:
-        name = svc["name"]
-        is_up = current_status.get(name, False)
-        status_dict[name] = "UP" if is_up else "DOWN"
-    return jsonify(status_dict)
+    global _status_cache
+    snapshot = get_current_status()
+    cached = _status_cache
+    if cached is None or cached[0] is not snapshot:
+        status_dict = {}
+        for svc in SERVICES:
+            is_up = snapshot.get(svc["name"])
+            status_dict[svc["name"]] = _UNKNOWN if is_up is None else _UP if is_up else _DOWN
+        cached = (snapshot, orjson.dumps(status_dict))
+        _status_cache = cached
+
+    response = Response(cached[1], mimetype="application/json")
+    response.headers["Cache-Control"] = f"max-age={STATUS_MAX_AGE}"
+    return response
+
+
+def fetch_recent_history(names):
+    """
+    Fetch the last MAX_HISTORY checks for each service name in one statement.
+    Returns {name: [rows newest first]}; each row has .status and .timestamp.
+    """
+    records_by_service = {name: [] for name in names}
+    if not names:
+        return records_by_service
+
+    # One UNION ALL branch per service, each a primary-key range scan on
+    # (service_name, id) read backwards and limited to MAX_HISTORY rows.
+    per_service = [
+        select(CheckResult.service_name, CheckResult.id,
+               CheckResult.status, CheckResult.timestamp)
+        .where(CheckResult.service_name == name)
+        .order_by(CheckResult.id.desc())
+        .limit(MAX_HISTORY)
+        .subquery()
+        for name in names
+    ]
+    combined = union_all(*[select(sq) for sq in per_service]).subquery()
+    stmt = select(combined).order_by(combined.c.service_name, combined.c.id.desc())
+
+    for row in db_session.execute(stmt):
+        records_by_service[row.service_name].append(row)
+    return records_by_service
+
+
+def collapse_into_intervals(records):
+    """
+    Turn check records (newest first) into status intervals (newest first).
+    Consecutive records with the same status (heartbeats) are merged.
+    Returns a list of (status, start, end); end is None for the current interval.
+    """
+    intervals = []
+    end = None
+    for r in records:
+        if intervals and intervals[-1][0] == r.status:
+            # Same status as the newer record: extend that interval back in time
+            intervals[-1][1] = r.timestamp
+        else:
+            if intervals:
+                end = intervals[-1][1]
+            intervals.append([r.status, r.timestamp, end])
+    return [tuple(interval) for interval in intervals]
 
 
 @app.route("/history")
 def history():
     """
     Show recent history from the database for each service.
-    Displays the last MAX_HISTORY checks per service.
+    Displays the status intervals covered by the last MAX_HISTORY records
+    (status changes + heartbeats) per service.
     """
-    session = SessionLocal()
-    service_tables = ""
+    records_by_service = fetch_recent_history([svc["name"] for svc in SERVICES])
 
+    services = []
     for svc in SERVICES:
         name = svc["name"]
-        # Query last MAX_HISTORY checks in descending order (newest first)
-        records = (
-            session.query(CheckResult)
-            .filter(CheckResult.service_name == name)
-            .order_by(CheckResult.id.desc())
-            .limit(MAX_HISTORY)
-            .all()
-        )
-
-        # Build table rows
-        rows = ""
-        for r in records:
-            color = "#c8e6c9" if r.status else "#ffcdd2"
-            status_txt = "UP" if r.status else "DOWN"
-            ts_str = r.timestamp.strftime("%Y-%m-%d %H:%M:%S")
-            rows += f"""
-            <tr style="background-color: {color};">
-                <td>{ts_str}</td>
-                <td>{status_txt}</td>
-            </tr>
-            """
+        intervals = [
+            (
+                status,
+                start.strftime("%Y-%m-%d %H:%M:%S"),
+                end.strftime("%Y-%m-%d %H:%M:%S") if end else "now",
+            )
+            for status, start, end in collapse_into_intervals(records_by_service[name])
+        ]
+        services.append((name, intervals))
+
+    # Jinja compiles the template once and escapes every value it inserts
+    return render_template(
+        "history.html",
+        services=services,
+        up_color=UP_COLOR,
+        down_color=DOWN_COLOR,
+    )
+
+
+# -------------------- EMAIL ALERT FUNCTIONS --------------------
+# These run in the monitor process.
+class SMTPClient:
+    """
+    Keeps one authenticated SMTP connection open and reuses it for every
+    alert email, reconnecting (and re-authenticating) only when it's dropped.
+    """
 
-        # Wrap the rows in a service-specific table
-        service_tables += f"""
-        <h3>{name}</h3>
-        <table border="1" cellpadding="5" cellspacing="0">
-            <tr>
-                <th>Timestamp</th>
-                <th>Status</th>
-            </tr>
-            {rows}
-        </table>
-        <br/>
+    def __init__(self, host, port, username, password):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.server = None
+        self.lock = threading.Lock()
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=SMTP_TIMEOUT)
+        try:
+            server.starttls()
+            server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        self.server = server
+
+    def _disconnect(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except (smtplib.SMTPException, OSError):
+                self.server.close()
+            self.server = None
+
+    def _is_alive(self):
+        try:
+            return self.server is not None and self.server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def send(self, subject, body):
+        """
+        Sends one email to ALERT_RECIPIENT, connecting first if needed.
         """
+        email_msg = f"Subject: {subject}\n\n{body}"
+        with self.lock:
+            if not self._is_alive():
+                self._disconnect()
+                self._connect()
+            try:
+                self.server.sendmail(self.username, ALERT_RECIPIENT, email_msg)
+            except smtplib.SMTPServerDisconnected:
+                # Dropped between the NOOP and the send; reconnect once and retry
+                self._disconnect()
+                self._connect()
+                self.server.sendmail(self.username, ALERT_RECIPIENT, email_msg)
+
+    def keepalive(self):
+        """
+        Sends a NOOP on an open connection; drops it if the server went away.
+        Does nothing when no connection is open.
+        """
+        with self.lock:
+            if self.server is not None and not self._is_alive():
+                self._disconnect()
 
-    session.close()
+    def close(self):
+        with self.lock:
+            self._disconnect()
 
-    html_template = f"""
-    <html>
-    <head>
-        <title>Downtime Monitor - History</title>
-    </head>
-    <body>
-        <h1>Recent Check History</h1>
-        {service_tables}
-        <p><a href="/">Back to Home</a></p>
-    </body>
-    </html>
-    """
-    return html_template
+
+smtp_client = SMTPClient(SMTP_SERVER, SMTP_PORT, SENDER_EMAIL, SENDER_PASSWORD)
+
+# Status changes are queued and sent as one digest email per ALERT_BATCH_WINDOW,
+# so an outage hitting several services costs one SMTP handshake, not one each.
+alert_queue = []  # list of (service_name, was_up) tuples
+alert_lock = threading.Lock()
 
 
-# -------------------- EMAIL ALERT FUNCTION --------------------
 def send_email_alert(service_name, was_up):
     """
-    Sends an email alert when a service changes status.
+    Queues an email alert for a service that changed status.
     was_up=True => The service WAS up, now it's down.
     was_up=False => The service WAS down, now it's up.
     """
-    new_status = "DOWN" if was_up else "UP"
-    subject = f"[ALERT] {service_name} is {new_status}"
-    body = f"Service '{service_name}' just went {new_status}. Check ASAP!"
+    with alert_lock:
+        alert_queue.append((service_name, was_up))
 
-    email_msg = f"Subject: {subject}\n\n{body}"
+
+def flush_email_alerts():
+    """
+    Drains the alert queue and sends everything in it as a single email.
+    """
+    with alert_lock:
+        if not alert_queue:
+            return
+        pending = alert_queue[:]
+        alert_queue.clear()
+
+    changes = [(name, "DOWN" if was_up else "UP") for name, was_up in pending]
+    if len(changes) == 1:
+        name, new_status = changes[0]
+        subject = f"[ALERT] {name} is {new_status}"
+    else:
+        subject = f"[ALERT] {len(changes)} service status changes"
+    lines = [f"Service '{name}' just went {new_status}." for name, new_status in changes]
+    body = "\n".join(lines) + "\nCheck ASAP!"
 
     try:
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            server.login(SENDER_EMAIL, SENDER_PASSWORD)
-            server.sendmail(SENDER_EMAIL, ALERT_RECIPIENT, email_msg)
-        print(f"[EMAIL ALERT] {service_name} is {new_status}")
+        smtp_client.send(subject, body)
+        for name, new_status in changes:
+            print(f"[EMAIL ALERT] {name} is {new_status}")
     except Exception as e:
         print("Failed to send email alert:", e)
 
 
+def alert_sender():
+    """
+    Runs in a background thread of the monitor process.
+    Sends the queued alerts once every ALERT_BATCH_WINDOW seconds, and keeps
+    the SMTP connection warm with a NOOP every SMTP_KEEPALIVE_INTERVAL seconds.
+    """
+    last_keepalive = time.monotonic()
+    while True:
+        time.sleep(min(ALERT_BATCH_WINDOW, SMTP_KEEPALIVE_INTERVAL))
+        flush_email_alerts()
+
+        if time.monotonic() - last_keepalive >= SMTP_KEEPALIVE_INTERVAL:
+            smtp_client.keepalive()
+            last_keepalive = time.monotonic()
+
+
 # -------------------- MONITORING LOOP --------------------
+def check_service(svc):
+    """
+    Probe a single service. Returns True if it answered 2xx/3xx, False otherwise.
+    Sends HEAD so no body is downloaded; servers that refuse HEAD get a
+    streamed GET that is closed as soon as the status line arrives.
+    """
+    try:
+        resp = http_session.head(svc["url"], timeout=CHECK_TIMEOUT, allow_redirects=True)
+        if resp.status_code in HEAD_REJECTED_CODES:
+            resp = http_fallback_session.get(svc["url"], timeout=CHECK_TIMEOUT, stream=True)
+            resp.close()
+        return 200 <= resp.status_code < 400
+    except Exception:
+        return False
+
+
 def monitor_services():
     """
-    Runs in a background thread.
-    Periodically checks each service, updates current_status,
-    logs to DB, and sends email alerts on status changes.
+    Runs in the background monitor process (see run_monitor_process).
+    Checks each service every CHECK_INTERVAL seconds, stores the latest status
+    in service_status, logs status changes (plus periodic heartbeats) to the DB,
+    and sends email alerts on status changes.
+    All services are probed concurrently, so a tick takes about as long
+    as the slowest service rather than the sum of all of them.
     """
+    global _last_check_id
     previous_status = {}
-    session = SessionLocal()
-
-    # Initialize current_status so the main page has at least some data
-    for svc in SERVICES:
-        name = svc["name"]
-        current_status[name] = False  # default false until first check
+    fail_streak = {}  # service name -> consecutive failed checks
+    last_written = {}  # service name -> timestamp of its last DB row
+    changed_at = {}  # service name -> timestamp of its last status change
+
+    # Keep new ids above any already stored, even if the clock went backwards
+    with engine.connect() as conn:
+        max_id = conn.execute(select(func.max(CheckResult.id))).scalar()
+        stored = conn.execute(
+            select(ServiceStatus.service_name, ServiceStatus.status, ServiceStatus.changed_at)
+            .where(ServiceStatus.service_name.in_([svc["name"] for svc in SERVICES]))
+        ).all()
+    _last_check_id = max(_last_check_id, max_id or 0)
+
+    # Pick up where the previous monitor process left off, so a status change
+    # across a restart (crash, watchdog restart, redeploy) alerts like any other
+    for name, status, since in stored:
+        previous_status[name] = status
+        changed_at[name] = since
+        if not status:
+            fail_streak[name] = FAIL_STREAK  # already DOWN, not on probation
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(MAX_CONCURRENT_CHECKS, len(SERVICES)))
+    )
+    last_optimize = time.monotonic()
+    next_tick = time.monotonic()
 
     while True:
-        for svc in SERVICES:
-            name = svc["name"]
-            url = svc["url"]
+        # Make the HTTP requests in parallel; results come back in SERVICES order
+        results = executor.map(check_service, SERVICES)
 
-            # Make an HTTP request
-            try:
-                resp = requests.get(url, timeout=10)
-                is_up = (resp.status_code == 200)
-            except Exception:
-                is_up = False
+        # One UTC timestamp for the whole tick (avoids DST ambiguity in the DB)
+        now = datetime.utcnow()
+        ts_str = now.isoformat(sep=" ", timespec="seconds")
 
-            # If we don't have a previous status, set it now
-            if name not in previous_status:
-                previous_status[name] = is_up
+        new_rows = []
+        status_rows = []
+        for svc, probe_ok in zip(SERVICES, results):
+            name = svc["name"]
 
-            # Check for a status change
-            if previous_status[name] != is_up:
+            # A service that was UP (or has no known status yet: UP on
+            # probation) is only reported DOWN after FAIL_STREAK failed checks
+            # in a row, so one blip doesn't trigger an alert
+            if probe_ok:
+                fail_streak[name] = 0
+                is_up = True
+            else:
+                fail_streak[name] = fail_streak.get(name, 0) + 1
+                is_up = previous_status.get(name, True) and fail_streak[name] < FAIL_STREAK
+
+            # Check for a status change (the first check just sets the baseline)
+            changed = name in previous_status and previous_status[name] != is_up
+            if changed:
                 send_email_alert(name, was_up=previous_status[name])
-                previous_status[name] = is_up
-
-            # Update our in-memory status
-            current_status[name] = is_up
-
-            # Write a record into the database
-            new_record = CheckResult(
-                service_name=name,
-                status=is_up,
-                timestamp=datetime.now()
-            )
-            session.add(new_record)
-            session.commit()
+            previous_status[name] = is_up
+
+            # Refresh service_status for the web process; checked_at moves on
+            # every tick so the web side can tell when the monitor stops. This
+            # costs one small write transaction per tick (an upsert of one row
+            # per service), even when check_results gets nothing new.
+            if changed or name not in changed_at:
+                changed_at[name] = now
+            status_rows.append({
+                "service_name": name,
+                "status": is_up,
+                "changed_at": changed_at[name],
+                "checked_at": now,
+            })
+
+            # Queue a record for the database (committed once per tick below),
+            # but only on a status change, the first check, or a heartbeat
+            last = last_written.get(name)
+            if changed or last is None or (now - last).total_seconds() >= HEARTBEAT_INTERVAL:
+                new_rows.append({
+                    "id": next_check_id(),
+                    "service_name": name,
+                    "status": is_up,
+                    "timestamp": now,
+                })
+                last_written[name] = now
 
             # Print to console for debugging
-            ts_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             print(f"{ts_str} | {name} | {'UP' if is_up else 'DOWN'}")
 
-        # Wait before the next check
-        time.sleep(CHECK_INTERVAL)
+        # Write the whole tick in a single transaction (one fsync, not one per
+        # service) as Core executemanys; these rows are never loaded back
+        # through the ORM, so there's no point in building CheckResult objects
+        if status_rows:
+            with engine.begin() as conn:
+                if new_rows:
+                    conn.execute(insert_check_results, new_rows)
+                if upsert_service_status is not None:
+                    conn.execute(upsert_service_status, status_rows)
+                else:
+                    names = [row["service_name"] for row in status_rows]
+                    conn.execute(delete(ServiceStatus).where(ServiceStatus.service_name.in_(names)))
+                    conn.execute(insert(ServiceStatus.__table__), status_rows)
+
+        # Let SQLite refresh its query planner statistics now and then
+        if IS_SQLITE_FILE and time.monotonic() - last_optimize >= OPTIMIZE_INTERVAL:
+            with engine.begin() as conn:
+                conn.execute(text("PRAGMA optimize"))
+            last_optimize = time.monotonic()
+
+        # Wait for the next slot on a fixed CHECK_INTERVAL grid, so the cadence
+        # doesn't drift by the tick duration. If a tick overran one or more
+        # slots, skip them rather than firing back-to-back.
+        next_tick += CHECK_INTERVAL
+        now_mono = time.monotonic()
+        if now_mono > next_tick:
+            missed = (now_mono - next_tick) // CHECK_INTERVAL + 1
+            next_tick += missed * CHECK_INTERVAL
+        time.sleep(max(0, next_tick - time.monotonic()))
+
+
+# -------------------- BACKGROUND TASKS --------------------
+_background_started = False
+_background_lock = threading.Lock()
+_monitor_process = None
+_shutting_down = False
+_mp_spawn = multiprocessing.get_context("spawn")
+
+
+def _exit_on_sigterm(signum, frame):
+    sys.exit(0)
+
+
+def watch_parent_process(parent_pid):
+    """
+    Runs in a background thread of the monitor process.
+    If the web process that started us is gone (e.g. SIGKILLed by gunicorn or
+    the OOM killer, so no clean shutdown), stop the monitor too; otherwise the
+    orphan would keep running next to the monitor of the replacement worker.
+    """
+    while os.getppid() == parent_pid:
+        time.sleep(1)
+    print("Web process is gone; stopping the monitor process")
+    os.kill(os.getpid(), signal.SIGTERM)  # exit via the normal shutdown path
+
+
+def run_monitor_process(parent_pid):
+    """
+    Entry point of the background monitor process.
+    Runs the alert thread and the monitoring loop; on shutdown (SIGTERM from
+    the web process exiting, or the web process disappearing) it sends any
+    queued alerts before exiting.
+    """
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    parent_thread = threading.Thread(
+        target=watch_parent_process, args=(parent_pid,), daemon=True
+    )
+    parent_thread.start()
+
+    alert_thread = threading.Thread(target=alert_sender, daemon=True)
+    alert_thread.start()
+    try:
+        monitor_services()
+    finally:
+        flush_email_alerts()
+        smtp_client.close()
+
+
+def start_monitor_process():
+    """
+    Starts (or restarts) the background monitor process.
+    Uses "spawn" rather than fork(): this runs in a web process with request
+    (and watchdog) threads, and a forked child could inherit a lock one of
+    them was holding, e.g. in the SQLAlchemy pool or stdio, and deadlock.
+    The spawned child re-imports this module and starts from a clean state.
+    """
+    global _monitor_process
+    _monitor_process = _mp_spawn.Process(
+        target=run_monitor_process, args=(os.getpid(),),
+        name="downtime-monitor", daemon=True,
+    )
+    _monitor_process.start()
+
+
+def watch_monitor_process():
+    """
+    Runs in a background thread of the web process.
+    Restarts the monitor process whenever it has died. Until the new process
+    completes a tick, the dashboard shows its statuses as UNKNOWN.
+    """
+    while True:
+        time.sleep(MONITOR_WATCHDOG_INTERVAL)
+        if _shutting_down:
+            return
+        if not _monitor_process.is_alive():
+            print(f"Monitor process exited (code {_monitor_process.exitcode}); restarting it")
+            start_monitor_process()
+
+
+def _stop_watchdog():
+    global _shutting_down
+    _shutting_down = True
+
+
+def start_background_tasks():
+    """
+    Starts the monitor process, plus a watchdog thread that restarts it if it
+    dies, exactly once per web process.
+    Called from __main__ and from wsgi.py, so it is safe to call repeatedly.
+    The monitor gets its own interpreter (no GIL contention with request
+    handlers, and a crash there doesn't take down the dashboard); the two
+    processes share state only through the SQLite database.
+    """
+    global _background_started
+    with _background_lock:
+        if _background_started:
+            return
+        _background_started = True
+
+    start_monitor_process()
+
+    # Registered after the first Process start, so it runs before
+    # multiprocessing's own exit handler terminates the monitor
+    atexit.register(_stop_watchdog)
+    watchdog_thread = threading.Thread(target=watch_monitor_process, daemon=True)
+    watchdog_thread.start()
 
 
 # -------------------- MAIN ENTRY POINT --------------------
 if __name__ == "__main__":
-    # Start background monitoring thread
-    monitor_thread = threading.Thread(target=monitor_services, daemon=True)
-    monitor_thread.start()
+    start_background_tasks()
 
-    # Run Flask server
-    app.run(port=5000, debug=True)
+    # Run Flask's built-in server (threaded, no debug reloader, which would
+    # start a second copy of the monitor). For production use wsgi.py:
+    #   gunicorn -w 1 --threads 8 -k gthread wsgi:app
+    app.run(port=5000, debug=False, threaded=True)
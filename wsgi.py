@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+
+"""
+WSGI entry point for running the Downtime Monitor under a production server.
+
+Usage:
+    gunicorn -w 1 --threads 8 -k gthread -b 127.0.0.1:5000 wsgi:app
+
+Keep a single worker (-w 1): each worker process runs its own monitor loop.
+"""
+
+from monitor import app, start_background_tasks
+
+start_background_tasks()